@@ -0,0 +1,8 @@
+CREATE TABLE integrity_checks (
+    path TEXT NOT NULL,
+    mtime INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    signature TEXT,
+    time TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (path)
+);
@@ -51,9 +51,20 @@ def upconv(path):
 
 @check.command()
 @click.argument("path", type=click.Path(exists=True, resolve_path=True))
-def integrity(path):
-    """Check the integrity of audio files"""
-    handle_integrity_check(path)
+@click.option(
+    "--recheck",
+    "-r",
+    is_flag=True,
+    help="Check every file, even those which passed before and are unchanged",
+)
+def integrity(path, recheck):
+    """
+    Check the integrity of audio files
+
+    Files which passed a previous check and are unchanged are skipped. Use
+    --recheck to catch on-disk corruption that the cache cannot detect.
+    """
+    handle_integrity_check(path, recheck)
 
 
 @check.command()
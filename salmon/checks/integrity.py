@@ -1,20 +1,22 @@
 import os
 import re
+import sqlite3
 import subprocess
+from itertools import compress
 
 import click
+from mutagen import MutagenError
+from mutagen.flac import FLAC
 
 from salmon import cfg
 from salmon.common.figles import process_files
+from salmon.database import DB_PATH
 
-FLAC_IMPORTANT_REGEXES = [
-    re.compile(".+\\.flac: testing,.*\x08ok"),
-]
+FLAC_IMPORTANT_RE = re.compile(".+\\.flac: testing,.*\x08ok")
+MP3_IMPORTANT_RE = re.compile(r"(?:WARNING|INFO): .*")
 
-MP3_IMPORTANT_REGEXES = [
-    re.compile(r"WARNING: .*"),
-    re.compile(r"INFO: .*"),
-]
+# Keep metaflac argument lists well below ARG_MAX on large directories.
+METAFLAC_BATCH_SIZE = 200
 
 
 def format_integrity(result):
@@ -29,19 +31,20 @@ def format_integrity(result):
         return output
 
 
-def handle_integrity_check(path):
+def handle_integrity_check(path, recheck=False):
     """Handle the integrity check process including UI and sanitization"""
     if os.path.isfile(path):
-        if not any(path.lower().endswith(ext) for ext in [".flac", ".mp3"]):
+        fmt = _audio_format(path)
+        if fmt not in INTEGRITY_CHECKERS:
             click.secho(f"File '{path}' is not a FLAC or MP3 file.", fg="red", bold=True)
             return
 
-        result = check_integrity(path)
+        result = check_integrity(path, recheck=recheck)
         click.echo(format_integrity(result))
 
         if (
             not result[0]
-            and path.lower().endswith(".flac")
+            and fmt == "flac"
             and click.confirm(click.style("\nWould you like to sanitize the file?", fg="magenta"))
         ):
             click.secho("\nSanitizing file...", fg="cyan", bold=True)
@@ -50,7 +53,7 @@ def handle_integrity_check(path):
             else:
                 click.secho("Sanitization failed", fg="red", bold=True)
     elif os.path.isdir(path):
-        result = check_integrity(path)
+        result = check_integrity(path, recheck=recheck)
         click.echo(format_integrity(result))
 
         if not result[0] and click.confirm(
@@ -65,39 +68,151 @@ def handle_integrity_check(path):
         raise click.Abort
 
 
-def check_integrity(path, _=None):
-    if path.lower().endswith(".flac"):
-        return _check_flac_integrity(path)
-    elif path.lower().endswith(".mp3"):
-        return _check_mp3_integrity(path)
-    elif os.path.isdir(path):
-        integrities_out = []
-        integrities = True
-        audio_files = []
-        for root, _, files in os.walk(path):
-            for f in files:
-                if any(f.lower().endswith(ext) for ext in [".mp3", ".flac"]):
-                    audio_files.append(os.path.join(root, f))
+def check_integrity(path, _=None, recheck=False):
+    """
+    Check the integrity of a file or every audio file in a directory. Files which
+    passed before and are unchanged are skipped, unless recheck is set or the
+    cache is disabled in the config. The cache key cannot see on-disk corruption.
+    """
+    use_cache = not recheck and cfg.upload.cache_integrity_checks
+    if os.path.isdir(path):
+        audio_files = list(_iter_audio_files(path))
         if not audio_files:
             click.secho("No audio files found in directory", fg="red", bold=True)
             raise click.Abort
-        results = process_files(audio_files, check_integrity, "Checking audio files")
-        for integrity, integrity_out in results:
-            integrities = integrities and integrity
-            integrities_out.append(integrity_out)
-        return integrities, "\n".join(integrities_out)
+        cache_keys = {f: _cache_key(f, fmt) for f, fmt in audio_files}
+        passed = _get_passed_files(cache_keys) if use_cache else set()
+        to_check = [(f, fmt) for f, fmt in audio_files if f not in passed]
+        results = process_files(to_check, _check_file_integrity, "Checking audio files") if to_check else []
+        checked, formats, integrities, integrities_out = zip(*results, strict=True) if results else ((), (), (), ())
+        cacheable = map(_is_cacheable, formats, integrities, integrities_out)
+        _record_passed_files({f: cache_keys[f] for f in compress(checked, cacheable)})
+        integrities_out = [_cached_integrity_output(f) for f in passed] + list(integrities_out)
+        return all(integrities), "\n".join(integrities_out)
+    fmt = _audio_format(path)
+    if fmt in INTEGRITY_CHECKERS:
+        cache_keys = {path: _cache_key(path, fmt)}
+        if use_cache and _get_passed_files(cache_keys):
+            return True, _cached_integrity_output(path)
+        _, _, integrity, integrity_out = _check_file_integrity((path, fmt))
+        if _is_cacheable(fmt, integrity, integrity_out):
+            _record_passed_files(cache_keys)
+        return integrity, integrity_out
     raise click.Abort
 
 
+def _iter_audio_files(path):
+    """
+    Recursively yield (path, format) for all FLAC and MP3 files under a
+    directory. Unreadable or vanished directories are skipped, as os.walk does.
+    """
+    try:
+        entries = os.scandir(path)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_audio_files(entry.path)
+            elif (fmt := _audio_format(entry.name)) in INTEGRITY_CHECKERS:
+                yield entry.path, fmt
+
+
+def _audio_format(path):
+    return os.path.splitext(path)[1][1:].lower()
+
+
+def _check_file_integrity(audio_file, _=None):
+    path, fmt = audio_file
+    return path, fmt, *INTEGRITY_CHECKERS[fmt](path)
+
+
+def _cache_key(path, fmt):
+    """
+    Build the key a previous successful check is matched against: mtime, size
+    and, for FLACs, the MD5 signature stored in STREAMINFO.
+    """
+    try:
+        stat = os.stat(path)
+        signature = f"{FLAC(path).info.md5_signature:032x}" if fmt == "flac" else None
+    except (OSError, MutagenError):
+        # Dangling symlinks and vanished files stay uncached and fail the real check.
+        return None
+    return stat.st_mtime_ns, stat.st_size, signature
+
+
+def _is_cacheable(fmt, integrity, integrity_out):
+    """
+    Only remember clean passes. mp3val exits 0 even when it reports warnings,
+    so MP3s with any WARNING/INFO output are re-checked to keep them visible.
+    """
+    return integrity and (fmt == "flac" or not integrity_out)
+
+
+def _cached_integrity_output(path):
+    return f"{os.path.basename(path)}: ok (unchanged since last check)"
+
+
+def _get_passed_files(cache_keys):
+    """
+    Return the files which passed a previous integrity check and have not been
+    modified since. Files are considered unchanged if their cache key matches.
+    """
+    passed = set()
+    try:
+        with sqlite3.connect(DB_PATH) as conn:
+            cursor = conn.cursor()
+            for path, key in cache_keys.items():
+                if key is None:
+                    continue
+                cursor.execute(
+                    "SELECT mtime, size, signature FROM integrity_checks WHERE path = ?",
+                    (os.path.abspath(path),),
+                )
+                if cursor.fetchone() == key:
+                    passed.add(path)
+    except sqlite3.OperationalError:
+        # Database has not been migrated yet, check everything.
+        return set()
+    return passed
+
+
+def _record_passed_files(cache_keys):
+    rows = [(os.path.abspath(path), *key) for path, key in cache_keys.items() if key is not None]
+    if not rows:
+        return
+    try:
+        with sqlite3.connect(DB_PATH) as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO integrity_checks (path, mtime, size, signature) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            conn.commit()
+    except sqlite3.OperationalError:
+        pass
+
+
+def _forget_files(paths):
+    """Drop cached results for files which are about to be rewritten."""
+    try:
+        with sqlite3.connect(DB_PATH) as conn:
+            conn.executemany(
+                "DELETE FROM integrity_checks WHERE path = ?",
+                [(os.path.abspath(path),) for path in paths],
+            )
+            conn.commit()
+    except sqlite3.OperationalError:
+        pass
+
+
+def _important_lines(output, important_re):
+    return "\n".join(line for line in output.split("\n") if important_re.match(line))
+
+
 def _check_flac_integrity(path):
     try:
         result = subprocess.check_output(["flac", "-wt", path], stderr=subprocess.STDOUT, text=True)
-        important_lines = []
-        for line in result.split("\n"):
-            for important_lines_re in FLAC_IMPORTANT_REGEXES:
-                if important_lines_re.match(line):
-                    important_lines.append(line)
-        return True, "\n".join(important_lines)
+        return True, _important_lines(result, FLAC_IMPORTANT_RE)
     except Exception:
         return False, click.style(f"{os.path.basename(path)}: Failed integrity", fg="red", bold=True)
 
@@ -105,38 +220,43 @@ def _check_flac_integrity(path):
 def _check_mp3_integrity(path):
     try:
         result = subprocess.check_output(["mp3val", path], text=True)
-        important_lines = []
-        for line in result.split("\n"):
-            for important_lines_re in MP3_IMPORTANT_REGEXES:
-                if important_lines_re.match(line):
-                    important_lines.append(line)
-        return True, "\n".join(important_lines)
+        return True, _important_lines(result, MP3_IMPORTANT_RE)
     except Exception:
         return False, click.style(f"{os.path.basename(path)}: Failed integrity", fg="red", bold=True)
 
 
+INTEGRITY_CHECKERS = {
+    "flac": _check_flac_integrity,
+    "mp3": _check_mp3_integrity,
+}
+
+
 def sanitize_integrity(path, _=None):
-    if path.lower().endswith(".flac"):
-        return _sanitize_flac(path)
-    elif path.lower().endswith(".mp3"):
-        return _sanitize_mp3(path)
-    elif os.path.isdir(path):
-        integrities = True
-        audio_files = []
-        for root, _, files in os.walk(path):
-            for f in files:
-                if any(f.lower().endswith(ext) for ext in [".mp3", ".flac"]):
-                    audio_files.append(os.path.join(root, f))
+    if os.path.isdir(path):
+        audio_files = list(_iter_audio_files(path))
         if not audio_files:
             return True
-        results = process_files(audio_files, sanitize_integrity, "Sanitizing audio files")
-        for integrity in results:
-            integrities = integrities and integrity
-        return integrities
-    raise click.Abort
+        _forget_files([f for f, _ in audio_files])
+        results = process_files(audio_files, _sanitize_file, "Sanitizing audio files")
+    elif (fmt := _audio_format(path)) in PER_FILE_SANITIZE_STEPS:
+        _forget_files([path])
+        results = [_sanitize_file((path, fmt))]
+    else:
+        raise click.Abort
+    reencoded = [f for f, fmt, integrity in results if integrity and fmt == "flac"]
+    return _reset_flac_metadata(reencoded) and all(integrity for _, _, integrity in results)
+
 
+def _sanitize_file(audio_file, _=None):
+    """
+    Run the per-file sanitize step. FLACs are only re-encoded here, their
+    metadata blocks are reset for all files at once by sanitize_integrity.
+    """
+    path, fmt = audio_file
+    return path, fmt, PER_FILE_SANITIZE_STEPS[fmt](path)
 
-def _sanitize_flac(path):
+
+def _reencode_flac(path):
     try:
         os.rename(path, path + ".corrupted")
         result = subprocess.run(
@@ -147,24 +267,43 @@ def _sanitize_flac(path):
         if result.returncode != 0:
             raise Exception(f"FLAC encoding failed:\n{result.stdout}\n{result.stderr}")
         os.remove(path + ".corrupted")
-        result = subprocess.run(
-            ["metaflac", "--dont-use-padding", "--remove", "--block-type=PADDING,PICTURE", path],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-        if result.returncode != 0:
-            raise Exception("Failed to remove FLAC metadata blocks")
-        result = subprocess.run(
-            ["metaflac", "--add-padding=8192", path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-        )
-        if result.returncode != 0:
-            raise Exception("Failed to add FLAC padding")
         return True
     except Exception as e:
         click.secho(f"Failed to sanitize {path}, {e}", fg="red", bold=True)
         return False
 
 
+def _reset_flac_metadata(paths):
+    """
+    Strip padding and pictures from the FLACs and add back 8KiB of padding.
+    metaflac accepts many files per invocation, so this is done in batches.
+    """
+    success = True
+    for i in range(0, len(paths), METAFLAC_BATCH_SIZE):
+        batch = paths[i : i + METAFLAC_BATCH_SIZE]
+        # metaflac fails a whole invocation when any one file fails, so padding is
+        # always added back, otherwise the other files in the batch are left without.
+        removed = _run_metaflac(["--dont-use-padding", "--remove", "--block-type=PADDING,PICTURE"], batch)
+        padded = _run_metaflac(["--add-padding=8192"], batch)
+        if not (removed and padded):
+            click.secho(
+                f"Failed to reset FLAC metadata in batch {i // METAFLAC_BATCH_SIZE + 1} ({len(batch)} files)",
+                fg="red",
+                bold=True,
+            )
+            success = False
+    return success
+
+
+def _run_metaflac(args, paths):
+    try:
+        # Let metaflac report failures itself so the affected files are named.
+        return subprocess.run(["metaflac", *args, *paths], stdout=subprocess.DEVNULL).returncode == 0
+    except OSError as e:
+        click.secho(f"Failed to run metaflac, {e}", fg="red", bold=True)
+        return False
+
+
 def _sanitize_mp3(path):
     try:
         backup_path = path + ".corrupted"
@@ -194,3 +333,9 @@ def _sanitize_mp3(path):
         if os.path.exists(backup_path) and not os.path.exists(path):
             os.rename(backup_path, path)
         return False
+
+
+PER_FILE_SANITIZE_STEPS = {
+    "flac": _reencode_flac,
+    "mp3": _sanitize_mp3,
+}
@@ -1,6 +1,7 @@
 import io
 import os
 import re
+import shutil
 
 import click
 import filetype
@@ -14,15 +15,19 @@ from PIL import Image
 from salmon import cfg
 from salmon.common import get_audio_files
 
+COVER_CHUNK_SIZE = 256 * 1024
+COVER_SNIFF_SIZE = 32
+COVER_FILENAME_RE = re.compile(r"^(cover|folder)\.(jpe?g|png)$", flags=re.IGNORECASE)
+
 
 def get_cover_from_path(path):
     """
     Search a folder for a cover image, return its path.
     """
-    for filename in os.listdir(path):
-        if re.match(r"^(cover|folder)\.(jpe?g|png)$", filename, flags=re.IGNORECASE):
-            fpath = os.path.join(path, filename)
-            return fpath
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if COVER_FILENAME_RE.match(entry.name):
+                return entry.path
     click.secho(f"Did not find a cover in path {path}", fg="red")
     return None
 
@@ -51,25 +56,27 @@ def _download_cover(path, cover_url):
     ext = os.path.splitext(cover_url)[1]
     c = "c" if cfg.upload.formatting.lowercase_cover else "C"
     headers = {"User-Agent": "smoked-salmon-v1"}
-    stream = requests.get(cover_url, stream=True, headers=headers)
+    with requests.get(cover_url, stream=True, headers=headers) as stream:
+        if stream.status_code >= 400:
+            click.secho(f"\nFailed to download cover image (ERROR {stream.status_code})", fg="red")
+            return None
+
+        # Sniff the image type from the first bytes so non-images never touch the disk.
+        stream.raw.decode_content = True
+        head = stream.raw.read(COVER_SNIFF_SIZE)
+        kind = filetype.guess(head)
+        if not kind or kind.mime not in ["image/jpeg", "image/png"]:
+            click.secho("\nFailed to download cover image (ERROR file is not an image [JPEG, PNG])", fg="red")
+            return None
 
-    if stream.status_code < 400:
         cover_image_filename = c + "over" + ext
         cover_path = os.path.join(path, cover_image_filename)
         with open(cover_path, "wb") as f:
-            for chunk in stream.iter_content(chunk_size=5096):
-                if chunk:
-                    f.write(chunk)
+            f.write(head)
+            shutil.copyfileobj(stream.raw, f, COVER_CHUNK_SIZE)
 
-        kind = filetype.guess(cover_path)
-        if not kind or kind.mime not in ["image/jpeg", "image/png"]:
-            os.remove(cover_path)
-            click.secho("\nFailed to download cover image (ERROR file is not an image [JPEG, PNG])", fg="red")
-        click.secho(f"Cover image downloaded: {cover_image_filename} ", fg="yellow")
-        return cover_path
-    else:
-        click.secho(f"\nFailed to download cover image (ERROR {stream.status_code})", fg="red")
-        return None
+    click.secho(f"Cover image downloaded: {cover_image_filename} ", fg="yellow")
+    return cover_path
 
 
 def compress_to_target_size(image, target_size):
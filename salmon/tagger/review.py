@@ -9,6 +9,15 @@ from salmon.errors import InvalidMetadataError
 from salmon.tagger.metadata import _print_metadata
 from salmon.tagger.sources.base import generate_artists
 
+RELEASE_TYPE_NAMES = tuple(RELEASE_TYPES)
+RELEASE_TYPE_LOOKUP = {r.lower(): r for r in RELEASE_TYPE_NAMES}
+# Each artist line must start after a newline, so the match can't backtrack over '>' within a line.
+TRACK_BLOCK_RE = re.compile(
+    r"Disc (\S+) Track (\S+)\s*\n\s*Title[ \t]*:[ \t]*(\S[^\n]*?)\s*\n\s*Artists:[ \t\r]*((?:\n\s*>[^\n]*)*)\s*"
+)
+TRACK_SEPARATOR_RE = re.compile("\r?\n-+\r?\n")
+ALIAS_MARKER = "Refer to README for syntax."
+
 
 def review_metadata(metadata, validator):
     """
@@ -42,14 +51,16 @@ def review_metadata(metadata, validator):
             )
         )
         r_let = r[0].lower()
-        try:
-            edit_functions[r_let](metadata)
-        except KeyError:
-            if r_let == "n":
-                break_ = True
-            else:
-                click.secho(f"{r_let} is not a valid editing option.", fg="red")
+        edit_function = edit_functions.get(r_let)
+        if edit_function:
+            # Editors return a truthy value only when they changed the metadata.
+            if not edit_function(metadata):
                 continue
+        elif r_let == "n":
+            break_ = True
+        else:
+            click.secho(f"{r_let} is not a valid editing option.", fg="red")
+            continue
         try:
             validator(metadata)
         except InvalidMetadataError as e:
@@ -64,6 +75,11 @@ def review_metadata(metadata, validator):
     return metadata
 
 
+def _iter_tracks(metadata):
+    """Yield a (disc number, track number, track) tuple for every track in the release."""
+    return ((dnum, tnum, track) for dnum, disc in metadata["tracks"].items() for tnum, track in disc.items())
+
+
 def _check_for_empty_release_type(metadata):
     if not metadata["rls_type"]:
         _edit_release_type(metadata)
@@ -88,28 +104,23 @@ def _edit_artists(metadata):
         if not artist_text:
             return
         try:
-            artists_li = [t.strip() for t in artist_text.split("\n") if t.strip()]
+            artists_li = [s for s in map(str.strip, artist_text.splitlines()) if s]
             tuples_artists_list = []
             for artist_line in artists_li:
-                name, role = artist_line.rsplit(" ", 1)
-                role = re.search(r"\((.+)\)", role)[1].lower()
-                tuples_artists_list.append((name, role))
+                tuples_artists_list.append(_parse_artist_line(artist_line))
             metadata["artists"] = tuples_artists_list
 
-            # Now update the track-level artists
-            for _disc_number, disc_data in metadata["tracks"].items():
-                for _track_number, track_info in disc_data.items():
-                    track_artists = track_info["artists"]
-                    updated_track_artists = []
-                    for artist_name, artist_role in track_artists:
-                        # Update role for each artist from the album-level metadata
-                        updated_role = next(
-                            (role for name, role in tuples_artists_list if name == artist_name), artist_role
-                        )
-                        updated_track_artists.append((artist_name, updated_role))
-                    track_info["artists"] = updated_track_artists
-
-            return
+            # Now update the track-level artists with the roles from the album-level metadata
+            role_map = {}
+            for name, role in tuples_artists_list:
+                role_map.setdefault(name, role)
+            for _, _, track in _iter_tracks(metadata):
+                track["artists"] = [
+                    (artist_name, role_map.get(artist_name, artist_role))
+                    for artist_name, artist_role in track["artists"]
+                ]
+
+            return True
         except (ValueError, KeyError, TypeError) as e:
             click.confirm(
                 click.style(f"The tracks file is invalid ({type(e)}: {e}), retry?", fg="red"),
@@ -118,27 +129,37 @@ def _edit_artists(metadata):
             )
 
 
+def _parse_artist_line(line):
+    """Split a `Name (role)` line into a (name, lowercased role) tuple."""
+    name, sep, role = line.rpartition(" (")
+    if not sep or not name or len(role) < 2 or not role.endswith(")"):
+        raise ValueError(f"Invalid artist line: {line}")
+    return name, role[:-1].lower()
+
+
 def _alias_artists(metadata):  # noqa: C901
-    existing_artists = {a for a, _ in metadata["artists"]}
+    display_names = sorted({a for a, _ in metadata["artists"]})
+    existing_artists = {a.lower() for a in display_names}
+    alias_template = "\n".join(display_names) + f"\n\nEnter the artist alias list below. {ALIAS_MARKER}\n\n"
     while True:
         artist_aliases = defaultdict(list)
-        artists_to_delete = []
-        artist_list = (
-            "\n".join({a for a, _ in metadata["artists"]})
-            + "\n\nEnter the artist alias list below. Refer to README for syntax.\n\n"
-        )
-        artist_list = click.edit(artist_list, editor=cfg.upload.default_editor)
+        artists_to_delete = set()
+        artist_list = click.edit(alias_template, editor=cfg.upload.default_editor)
         try:
-            artist_text = artist_list.split("Refer to README for syntax.")[1].strip()
-            for line in artist_text.split("\n"):
+            _, marker, artist_text = artist_list.partition(ALIAS_MARKER)
+            if not marker:
+                raise ValueError
+            artist_text = artist_text.strip()
+            for line in artist_text.splitlines():
                 if line:
                     existing, new = [a.strip() for a in line.split("-->", 1)]
+                    existing = existing.lower()
                     if existing not in existing_artists:
                         raise ValueError  # Too lazy to create new exception.
                     if new:
-                        artist_aliases[existing.lower()].append(new)
+                        artist_aliases[existing].append(new)
                     else:
-                        artists_to_delete.append(existing.lower())
+                        artists_to_delete.add(existing)
             break
         except (IndexError, ValueError):
             click.confirm(
@@ -149,34 +170,31 @@ def _alias_artists(metadata):  # noqa: C901
         except AttributeError:
             return
 
-    for i, (artist, importa) in enumerate(metadata["artists"]):
-        if artist.lower() in artist_aliases:
-            metadata["artists"].pop(i)
-            for artist_name in artist_aliases[artist.lower()]:
-                if artist_name:
-                    metadata["artists"].append((artist_name, importa))
-    for i, (artist, _) in enumerate(metadata["artists"]):
-        if artist.lower() in artists_to_delete:
-            metadata["artists"].pop(i)
-
-    for dnum, disc in metadata["tracks"].items():
-        for tnum, track in disc.items():
-            for i, (artist, importa) in enumerate(track["artists"]):
-                if artist.lower() in artist_aliases:
-                    metadata["tracks"][dnum][tnum]["artists"].pop(i)
-                    for artist_name in artist_aliases[artist.lower()]:
-                        if artist_name:
-                            metadata["tracks"][dnum][tnum]["artists"].append((artist_name, importa))
-    for dnum, disc in metadata["tracks"].items():
-        for tnum, track in disc.items():
-            for i, (artist, _) in enumerate(track["artists"]):
-                if artist.lower() in artists_to_delete:
-                    metadata["tracks"][dnum][tnum]["artists"].pop(i)
+    metadata["artists"] = _apply_artist_aliases(metadata["artists"], artist_aliases, artists_to_delete)
+    for _, _, track in _iter_tracks(metadata):
+        track["artists"] = _apply_artist_aliases(track["artists"], artist_aliases, artists_to_delete)
+    return True
+
+
+def _apply_artist_aliases(artists, artist_aliases, artists_to_delete):
+    """
+    Return a new artist list with deleted artists dropped and aliased artists
+    replaced by their aliases, in a single pass.
+    """
+    new_artists = []
+    for artist, importa in artists:
+        key = artist.lower()
+        if key in artists_to_delete:
+            continue
+        if key in artist_aliases:
+            new_artists.extend((artist_name, importa) for artist_name in artist_aliases[key] if artist_name)
+        else:
+            new_artists.append((artist, importa))
+    return new_artists
 
 
 def _edit_release_type(metadata):
     _print_release_types()
-    types = {r.lower(): r for r in RELEASE_TYPES}
     while True:
         rtype = (
             click.prompt(
@@ -186,15 +204,15 @@ def _edit_release_type(metadata):
             .strip()
             .lower()
         )
-        if rtype in types:
-            metadata["rls_type"] = types[rtype]
-            return
+        if rtype in RELEASE_TYPE_LOOKUP:
+            metadata["rls_type"] = RELEASE_TYPE_LOOKUP[rtype]
+            return True
         click.secho(f"{rtype} is not a valid release type.", fg="red")
 
 
 def _print_release_types():
-    types = RELEASE_TYPES.keys()
-    longest = max(len(r) for i, r in enumerate(types) if i % 2 == 0)
+    types = RELEASE_TYPE_NAMES
+    longest = max(map(len, types[::2]))
     click.secho("\nRelease Types:", fg="yellow", bold=True)
     for i, rtype in enumerate(types):
         click.echo(f"  {rtype.ljust(longest)}", nl=False)
@@ -207,6 +225,7 @@ def _edit_title(metadata):
     title = click.edit(metadata["title"], editor=cfg.upload.default_editor)
     if title:
         metadata["title"] = title.strip()
+        return True
 
 
 def _edit_years(metadata):
@@ -217,9 +236,12 @@ def _edit_years(metadata):
             if not text:
                 return
             year_line, group_year_line = (line.strip() for line in text.strip().split("\n", 1))
-            metadata["year"] = re.match(r"Year *: *(\d{4})", year_line)[1]
-            metadata["group_year"] = re.match(r"Group Year *: *(\d{4})", group_year_line)[1]
-            return
+            year = _parse_field(year_line, "Year")
+            group_year = _parse_field(group_year_line, "Group Year")
+            if not all(len(y) == 4 and y.isdecimal() for y in (year, group_year)):
+                raise ValueError
+            metadata["year"], metadata["group_year"] = year, group_year
+            return True
         except (TypeError, KeyError, ValueError):
             click.confirm(
                 click.style(
@@ -231,16 +253,26 @@ def _edit_years(metadata):
             )
 
 
+def _parse_field(line, key):
+    """Return the value of a `Key : Value` line, raising ValueError if the key doesn't match."""
+    name, sep, value = line.partition(":")
+    if not sep or name.rstrip() != key:
+        raise ValueError
+    return value.strip()
+
+
 def _edit_genres(metadata):
     genres = click.edit("\n".join(metadata["genres"]), editor=cfg.upload.default_editor)
     if genres:
-        metadata["genres"] = [g for g in genres.split("\n") if g.strip()]
+        metadata["genres"] = list(filter(None, map(str.strip, genres.splitlines())))
+        return True
 
 
 def _edit_urls(metadata):
     urls = click.edit("\n".join(metadata["urls"]), editor=cfg.upload.default_editor)
     if urls:
-        metadata["urls"] = [g for g in urls.split("\n") if g.strip()]
+        metadata["urls"] = list(filter(None, map(str.strip, urls.splitlines())))
+        return True
 
 
 def _edit_edition_info(metadata):
@@ -255,10 +287,11 @@ def _edit_edition_info(metadata):
             if not text:
                 return
             label_line, cat_line, title_line = (line.strip() for line in text.strip().split("\n", 2))
-            metadata["label"] = re.match(r"Label *: *(.*)", label_line)[1] or None
-            metadata["catno"] = re.match(r"Catalog Number *: *(.*)", cat_line)[1] or None
-            metadata["edition_title"] = re.match(r"Edition Title *: *(.*)", title_line)[1] or None
-            return
+            label = _parse_field(label_line, "Label") or None
+            catno = _parse_field(cat_line, "Catalog Number") or None
+            edition_title = _parse_field(title_line, "Edition Title") or None
+            metadata["label"], metadata["catno"], metadata["edition_title"] = label, catno, edition_title
+            return True
         except (TypeError, KeyError, ValueError):
             click.confirm(
                 click.style(
@@ -273,39 +306,43 @@ def _edit_edition_info(metadata):
 def _edit_comment(metadata):
     review = click.edit(metadata["comment"], editor=cfg.upload.default_editor)
     metadata["comment"] = review.strip() if review else None
+    return True
 
 
 def _edit_tracks(metadata):
     text_tracks_li = []
-    for dnum, disc in metadata["tracks"].items():
-        for tnum, track in disc.items():
-            text_tracks_li.append(
-                f"Disc {dnum} Track {tnum}\n"
-                f"Title: {track['title']}\n"
-                f"Artists:\n" + "\n".join(f"> {a} ({i})" for a, i in track["artists"])
-            )
+    for dnum, tnum, track in _iter_tracks(metadata):
+        text_tracks_li.append(
+            f"Disc {dnum} Track {tnum}\n"
+            f"Title: {track['title']}\n"
+            f"Artists:\n" + "\n".join(f"> {a} ({i})" for a, i in track["artists"])
+        )
 
-    text_tracks = "\n\n-----\n\n".join(text_tracks_li)
+    original_text = text_tracks = "\n\n-----\n\n".join(text_tracks_li)
     while True:
         text_tracks = click.edit(text_tracks, editor=cfg.upload.default_editor)
-        if not text_tracks:
+        if not text_tracks or text_tracks.strip() == original_text.strip():
             return
         try:
-            tracks_li = [tr for tr in re.split("\n-+\n", text_tracks) if tr.strip()]
+            tracks_li = [tr for tr in TRACK_SEPARATOR_RE.split(text_tracks) if tr.strip()]
+            # Parse every block before touching metadata, so a failed attempt leaves it untouched.
+            edits = []
             for track_tx in tracks_li:
-                ident, title, _, *artists_li = [t.strip() for t in track_tx.split("\n") if t.strip()]
-                r_ident = re.search(r"Disc ([^ ]+) Track ([^ ]+)", ident)
-                discnum, tracknum = r_ident[1], r_ident[2]
-                metadata["tracks"][discnum][tracknum]["title"] = re.search(r"Title *: *(.+)", title)[1]
+                block = TRACK_BLOCK_RE.fullmatch(track_tx.strip())
+                if not block:
+                    raise ValueError(f"Could not parse track block starting with {track_tx.strip()[:40]!r}")
+                discnum, tracknum, title, artists_tx = block.groups()
+                track = metadata["tracks"][discnum][tracknum]
 
                 tuples_artists_list = []
-                for artist_line in artists_li:
-                    artist_line_name, artist_line_role = artist_line.rsplit(" ", 1)
-                    artist_line_role = re.search(r"\((.+)\)", artist_line_role)[1].lower()
-                    tuples_artists_list.append((re.search(r"> *(.+)", artist_line_name)[1], artist_line_role))
-                metadata["tracks"][discnum][tracknum]["artists"] = tuples_artists_list
+                for artist_line in filter(None, map(str.strip, artists_tx.splitlines())):
+                    tuples_artists_list.append(_parse_artist_line(artist_line.removeprefix(">").strip()))
+                edits.append((track, title, tuples_artists_list))
+            for track, title, tuples_artists_list in edits:
+                track["title"] = title
+                track["artists"] = tuples_artists_list
             metadata["artists"], metadata["tracks"] = generate_artists(metadata["tracks"])
-            return
+            return True
         except (TypeError, ValueError, KeyError) as e:
             click.confirm(
                 click.style(f"The tracks file is invalid ({type(e)}: {e}), retry?", fg="red"),